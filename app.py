@@ -5,17 +5,121 @@ Demo MVP for claims compliance checking and provider attestation generation.
 
 import streamlit as st
 import pandas as pd
-from typing import List, Dict, Any
-import tempfile
-import os
+import io
+import logging
 from datetime import datetime
 
-from scrub import apply_checks, cleaned_csv_bytes
-from pdfs import zip_attestations
 import db
 import demo_data
 
 
+# Low-cardinality columns worth dictionary-encoding after parse
+CATEGORICAL_CLAIM_COLUMNS = ('DocStatus', 'ProcCode', 'Provider')
+
+# Columns the rule engine reads - always parsed as strings, never inferred
+EXPECTED_CLAIM_COLUMNS = (
+    'ClaimID', 'Provider', 'PatientID', 'ICD10', 'ProcCode',
+    'DocStatus', 'ServiceDate', 'POS', 'Modifiers'
+)
+
+# Single pre-rendered HIPAA banner - one websocket delta per rerun instead
+# of stacked error/warning/info messages
+HIPAA_BANNER_HTML = (
+    "<div style='background-color:#ffecec;border:1px solid #f5c2c7;"
+    "border-radius:0.5rem;padding:0.75rem 1rem;color:#842029;'>"
+    "🚨 <strong>Demo only. Do not upload PHI. This tool is not HIPAA compliant.</strong>"
+    "</div>"
+)
+
+# The only DB columns the dashboard (table, detail panel, modal, reminders)
+# ever reads - projected at the SQL level so reruns don't haul unused bytes
+DASHBOARD_COLS = (
+    'claim_id', 'provider', 'patient_id', 'icd10', 'proc_code',
+    'service_date', 'issues', 'attestation_status', 'signed_name',
+    'signed_at', 'verified_at', 'last_reminder_at'
+)
+
+
+def read_claims_csv(csv_bytes: bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded claims CSV into a DataFrame.
+
+    Uses pyarrow.csv.read_csv when available (parallel C++ parse straight
+    from the in-memory buffer, Arrow-backed string columns, blanks kept as
+    empty strings) and falls back to pandas' C engine otherwise.
+    Low-cardinality columns are cast to category so the rule engine's
+    .eq/.isin checks compare dictionary codes instead of Python strings.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+        table = pacsv.read_csv(
+            pa.py_buffer(csv_bytes),
+            read_options=pacsv.ReadOptions(block_size=1 << 20),
+            convert_options=pacsv.ConvertOptions(
+                column_types={c: pa.string() for c in EXPECTED_CLAIM_COLUMNS},
+                strings_can_be_null=False
+            )
+        )
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    except ImportError:
+        # 🔧 Fix: force pandas to keep blanks as empty strings
+        df = pd.read_csv(io.BytesIO(csv_bytes), dtype=str, keep_default_na=False)
+
+    for col in CATEGORICAL_CLAIM_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    return df
+
+
+def dataframe_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as CSV bytes for download.
+
+    Uses the pyarrow CSV writer when available (writes straight to a bytes
+    buffer in C, skipping the intermediate Python string), falling back to
+    pandas to_csv otherwise.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        buf = io.BytesIO()
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+        return buf.getvalue()
+    except ImportError:
+        return df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def run_compliance_checks(csv_bytes: bytes) -> pd.DataFrame:
+    """Parse the uploaded CSV and apply compliance checks, memoized by file content."""
+    from scrub import apply_checks
+    return apply_checks(read_claims_csv(csv_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def flagged_csv_payload(csv_bytes: bytes) -> bytes:
+    """Build the flagged-claims CSV download, memoized by the uploaded file content."""
+    from scrub import cleaned_csv_bytes
+    return cleaned_csv_bytes(run_compliance_checks(csv_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def attestation_zip_payload(csv_bytes: bytes) -> bytes:
+    """Build the attestation PDFs ZIP download, memoized by the uploaded file content."""
+    from pdfs import zip_attestations
+    return zip_attestations(run_compliance_checks(csv_bytes))
+
+
+@st.cache_resource
+def _ensure_db() -> bool:
+    """Run the idempotent schema setup once per process, not per rerun."""
+    logging.basicConfig(level=logging.INFO)
+    db.init_db()
+    return True
+
+
 def main() -> None:
     """Main Streamlit application."""
     st.set_page_config(
@@ -23,9 +127,9 @@ def main() -> None:
         page_icon="🏥",
         layout="wide"
     )
-    
+
     # Initialize database
-    db.init_db()
+    _ensure_db()
     
     # Clear old data on startup (for demo purposes)
     if 'db_cleared' not in st.session_state:
@@ -37,7 +141,7 @@ def main() -> None:
     st.markdown("**Demo MVP** - Claims compliance checking and provider attestation")
     
     # Single top warning banner
-    st.error("🚨 **Demo only. Do not upload PHI. This tool is not HIPAA compliant.**")
+    st.markdown(HIPAA_BANNER_HTML, unsafe_allow_html=True)
     
     # What this does box - shown once at top
     with st.expander("ℹ️ What this does", expanded=True):
@@ -79,13 +183,17 @@ def upload_claims_tab() -> None:
     
     if uploaded_file is not None:
         try:
-            # 🔧 Fix: force pandas to keep blanks as empty strings
-            df = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+            # Read the raw bytes once so the compliance run can be memoized by content
+            csv_bytes = uploaded_file.getvalue()
+            df = read_claims_csv(csv_bytes)
             st.success(f"✅ Successfully loaded {len(df)} claims")
             
-            # Display sample data
+            # Display sample data (bounded preview - serializing the full
+            # frame to the browser dominates page latency on large uploads)
             st.subheader("📊 Data Preview")
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(df.head(50), use_container_width=True)
+            if len(df) > 50:
+                st.caption(f"Showing first 50 of {len(df):,} rows")
             
             # Show column information
             st.subheader("📋 Column Information")
@@ -106,16 +214,37 @@ def upload_claims_tab() -> None:
             if st.button("🔍 Run Compliance Checks", type="primary", use_container_width=True):
                 with st.spinner("Running compliance checks..."):
                     try:
-                        # Apply compliance checks
-                        df_with_issues = apply_checks(df)
-                        
+                        # Apply compliance checks (cached - reruns only when the CSV changes)
+                        df_with_issues = run_compliance_checks(csv_bytes)
+
                         # Store in session state for downloads
                         st.session_state['df_with_issues'] = df_with_issues
                         st.session_state['original_df'] = df
-                        
-                        # Persist flagged claims to database
-                        db.upsert_claims(df_with_issues)
-                        st.success("✅ Compliance results saved to database")
+                        st.session_state['uploaded_csv_bytes'] = csv_bytes
+
+                        # Persist flagged claims to database, skipping the
+                        # write when identical results were already persisted
+                        import hashlib
+                        frame_bytes = pd.util.hash_pandas_object(
+                            df_with_issues.drop(columns=['Issues'], errors='ignore'),
+                            index=False
+                        ).values.tobytes()
+                        sig = hashlib.blake2b(frame_bytes, digest_size=16).hexdigest()
+                        if st.session_state.get('last_persisted_hash') != sig:
+                            persist_cols = [
+                                col for col in (
+                                    'ClaimID', 'PatientID', 'Provider', 'ICD10',
+                                    'ProcCode', 'DocStatus', 'ServiceDate',
+                                    'Issues', 'Issues_Str', '_HasIssue'
+                                )
+                                if col in df_with_issues.columns
+                            ]
+                            db.upsert_claims(df_with_issues[persist_cols])
+                            _invalidate_claims_cache()
+                            st.session_state['last_persisted_hash'] = sig
+                            st.success("✅ Compliance results saved to database")
+                        else:
+                            st.info("ℹ️ No changes — database already up to date")
                         
                     except Exception as e:
                         st.error(f"❌ Error running compliance checks: {str(e)}")
@@ -134,7 +263,7 @@ def upload_claims_tab() -> None:
     with col1:
         if st.button("📥 Download Sample Claims CSV", use_container_width=True):
             sample_df = create_sample_data()
-            csv = sample_df.to_csv(index=False)
+            csv = dataframe_csv_bytes(sample_df)
             st.download_button(
                 label="Download sample_claims.csv",
                 data=csv,
@@ -147,7 +276,7 @@ def upload_claims_tab() -> None:
         if st.button("🎯 Generate Demo Dataset (50 rows)", use_container_width=True):
             with st.spinner("Generating comprehensive demo dataset..."):
                 demo_df = demo_data.generate_demo_dataset(50)
-                csv = demo_df.to_csv(index=False)
+                csv = dataframe_csv_bytes(demo_df)
                 st.download_button(
                     label="Download demo_claims_50.csv",
                     data=csv,
@@ -157,9 +286,10 @@ def upload_claims_tab() -> None:
                 )
                 st.success("✅ Demo dataset generated with ~50% flagged claims!")
                 
-                # Show dataset statistics
-                stats = demo_data.get_demo_dataset_stats(demo_df)
+                # Show dataset statistics (computed only on this click, not
+                # on unrelated reruns)
                 with st.expander("📊 Demo Dataset Statistics", expanded=False):
+                    stats = demo_data.get_demo_dataset_stats(demo_df)
                     col_a, col_b = st.columns(2)
                     with col_a:
                         st.metric("Total Rows", stats['total_rows'])
@@ -180,36 +310,79 @@ def compliance_review_tab() -> None:
     """Compliance Review tab - shows results and downloads."""
     # Check if we have compliance results in session state
     if 'df_with_issues' in st.session_state:
-        df_with_issues = st.session_state['df_with_issues']
-        
-        # Display results
-        display_compliance_results(df_with_issues)
-        
-        # Generate downloads
-        generate_download_buttons(df_with_issues)
+        results_fragment(st.session_state['df_with_issues'])
     else:
         st.info("ℹ️ Please upload and process claims in the 'Upload Claims' tab first.")
 
 
+@st.fragment
+def results_fragment(df_with_issues: pd.DataFrame) -> None:
+    """Results panel isolated as a fragment so unrelated widget interactions
+    elsewhere in the app don't rerender it."""
+    # Compute the flagged mask once and share it across both sections
+    has_issue = flagged_claims_mask(df_with_issues)
+
+    # Display results
+    display_compliance_results(df_with_issues, has_issue)
+
+    # Generate downloads
+    generate_download_buttons(df_with_issues, has_issue)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_list_claims() -> pd.DataFrame:
+    """Cache the dashboard claims query so reruns skip the SQLite round-trip."""
+    return db.list_claims(columns=list(DASHBOARD_COLS), attested_only=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_stats() -> dict:
+    """Cache the attestation status counts alongside the claims query."""
+    return db.get_attestation_stats()
+
+
+@st.cache_data(show_spinner=False)
+def _filter_choices(sig: tuple) -> tuple:
+    """Provider/status dropdown options, keyed on a cheap frame signature."""
+    df = _cached_list_claims()
+    return (
+        sorted(df['provider'].dropna().unique().tolist()),
+        df['attestation_status'].dropna().unique().tolist()
+    )
+
+
+def _invalidate_claims_cache() -> None:
+    """Drop the cached dashboard queries after any write to the database."""
+    _cached_list_claims.clear()
+    _cached_stats.clear()
+    _filter_choices.clear()
+
+
 def attestation_dashboard_tab() -> None:
     """Attestation Dashboard tab - shows flagged claims from database with actions."""
     # Load flagged claims from database
     try:
-        claims_df = db.list_claims()
+        claims_df = _cached_list_claims()
         
         if claims_df.empty:
             st.info("ℹ️ No flagged claims found in the database.")
             return
         
-        # Filter out claims without attestations (shouldn't happen, but safety check)
-        claims_with_attestations = claims_df[claims_df['attestation_status'].notna()]
+        # Claims without attestations are already excluded at the SQL level
+        claims_with_attestations = claims_df
+
+        # Pre-fold issues to lowercase once so the search box is a plain
+        # substring scan instead of a per-rerun regex with case-folding
+        claims_with_attestations = claims_with_attestations.assign(
+            _issues_lc=claims_with_attestations['issues'].fillna('').str.lower()
+        )
         
         if claims_with_attestations.empty:
             st.info("ℹ️ No attestations found in the database.")
             return
         
         # Display summary stats
-        stats = db.get_attestation_stats()
+        stats = _cached_stats()
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -225,32 +398,45 @@ def attestation_dashboard_tab() -> None:
         st.subheader("🔍 Filters")
         filter_col1, filter_col2, filter_col3 = st.columns(3)
         
+        # Unique filter choices are cached on a cheap signature so widget
+        # interactions don't re-scan the full columns every rerun
+        sig = (
+            len(claims_with_attestations),
+            claims_with_attestations['claim_id'].iat[-1] if len(claims_with_attestations) else ''
+        )
+        providers, statuses = _filter_choices(sig)
+
         with filter_col1:
             # Provider filter
-            unique_providers = ['All'] + sorted(claims_with_attestations['provider'].unique().tolist())
-            selected_provider = st.selectbox("Provider", unique_providers)
-        
+            selected_provider = st.selectbox("Provider", ['All'] + providers)
+
         with filter_col2:
             # Status filter
-            unique_statuses = claims_with_attestations['attestation_status'].unique().tolist()
-            selected_statuses = st.multiselect("Status", unique_statuses, default=unique_statuses)
+            selected_statuses = st.multiselect("Status", statuses, default=statuses)
         
         with filter_col3:
             # Issue search
             issue_search = st.text_input("Search Issues", placeholder="Enter issue text...")
         
-        # Apply filters
-        filtered_df = claims_with_attestations.copy()
-        
+        # Compose filters into one boolean mask and index once, instead of
+        # copying the frame per applied filter
+        import numpy as np
+        mask = np.ones(len(claims_with_attestations), dtype=bool)
+
         if selected_provider != 'All':
-            filtered_df = filtered_df[filtered_df['provider'] == selected_provider]
-        
+            mask &= (claims_with_attestations['provider'].to_numpy() == selected_provider)
+
         if selected_statuses:
-            filtered_df = filtered_df[filtered_df['attestation_status'].isin(selected_statuses)]
-        
+            mask &= claims_with_attestations['attestation_status'].isin(selected_statuses).to_numpy()
+
         if issue_search:
-            filtered_df = filtered_df[filtered_df['issues'].str.contains(issue_search, case=False, na=False)]
-        
+            mask &= claims_with_attestations['_issues_lc'].str.contains(
+                issue_search.lower(), regex=False, na=False
+            ).to_numpy()
+
+        # Helper column is only for searching; keep it out of the display path
+        filtered_df = claims_with_attestations.loc[mask, claims_with_attestations.columns != '_issues_lc']
+
         # Remind pending > 48h button
         st.subheader("📧 Actions")
         col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
@@ -263,6 +449,7 @@ def attestation_dashboard_tab() -> None:
             if st.button("🧹 Clean Duplicates", type="secondary"):
                 deleted_count = db.cleanup_duplicate_attestations()
                 if deleted_count > 0:
+                    _invalidate_claims_cache()
                     st.success(f"✅ Removed {deleted_count} duplicate attestation records")
                     st.rerun()
                 else:
@@ -272,6 +459,7 @@ def attestation_dashboard_tab() -> None:
             if st.button("📦 Generate Attestation Packet", type="primary"):
                 try:
                     # Generate ZIP with current dashboard data (includes signatures and status)
+                    from pdfs import zip_attestations
                     zip_bytes = zip_attestations(claims_with_attestations)
                     st.download_button(
                         label="📦 Download Attestation Packet (ZIP)",
@@ -331,54 +519,74 @@ def attestation_dashboard_tab() -> None:
             st.info("No claims match the current filters.")
             return
         
-        # Create a table with actions for each row
-        for idx, row in filtered_df.iterrows():
+        # Single Arrow-backed table with row selection instead of one expander
+        # (and its widget tree) per claim
+        overview_columns = ['claim_id', 'provider', 'attestation_status', 'issues']
+        selection = st.dataframe(
+            filtered_df[overview_columns],
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="flagged_claims_table"
+        )
+
+        selected_rows = selection.selection.rows
+        if selected_rows:
+            idx = filtered_df.index[selected_rows[0]]
+            row = filtered_df.loc[idx]
             # Create unique key using both claim_id and row index to avoid duplicates
             unique_key = f"{row['claim_id']}_{idx}"
-            
-            with st.expander(f"Claim {row['claim_id']} - {row['provider']} ({row['attestation_status']})", expanded=False):
-                col1, col2, col3 = st.columns([2, 1, 1])
-                
-                with col1:
-                    st.write(f"**Issues:** {row['issues']}")
-                    if pd.notna(row['signed_at']):
-                        st.write(f"**Signed:** {row['signed_at']} by {row['signed_name']}")
-                    if pd.notna(row['verified_at']):
-                        st.write(f"**Verified:** {row['verified_at']}")
-                
-                with col2:
-                    if row['attestation_status'] == 'Pending':
-                        if st.button(f"📝 Open Attestation", key=f"open_{unique_key}"):
-                            st.session_state['selected_claim_for_attestation'] = {
-                                'claim_data': row.to_dict(),
-                                'unique_key': unique_key
-                            }
-                            st.write(f"DEBUG: Set modal state for {unique_key}")
-                            st.rerun()
-                    elif row['attestation_status'] == 'Signed':
-                        if st.button(f"✅ Verify", key=f"verify_{unique_key}"):
-                            db.set_attestation_status(row['claim_id'], 'Verified')
-                            st.success(f"Claim {row['claim_id']} verified!")
-                            st.rerun()
-                
-                with col3:
-                    if st.button(f"🔄 Refresh", key=f"refresh_{unique_key}"):
-                        st.rerun()
-        
+            _claim_action_panel(row.to_dict(), unique_key)
+
         # Handle attestation modal (outside the main loop)
         if 'selected_claim_for_attestation' in st.session_state:
             claim_info = st.session_state['selected_claim_for_attestation']
             claim_data = claim_info['claim_data']
             unique_key = claim_info['unique_key']
-            st.write(f"DEBUG: Opening modal for {unique_key}")
             show_attestation_modal(claim_data, unique_key)
-        
+
     except Exception as e:
         st.error(f"❌ Error loading attestation data: {str(e)}")
 
 
+@st.fragment
+def _claim_action_panel(row: dict, unique_key: str) -> None:
+    """Detail panel for the selected claim, isolated as a fragment so its
+    button clicks don't rerun the whole dashboard. The handlers that mutate
+    the database still call st.rerun() for a full refresh."""
+    st.markdown(f"**Claim {row['claim_id']} - {row['provider']} ({row['attestation_status']})**")
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.write(f"**Issues:** {row['issues']}")
+        if pd.notna(row['signed_at']):
+            st.write(f"**Signed:** {row['signed_at']} by {row['signed_name']}")
+        if pd.notna(row['verified_at']):
+            st.write(f"**Verified:** {row['verified_at']}")
+
+    with col2:
+        if row['attestation_status'] == 'Pending':
+            if st.button(f"📝 Open Attestation", key=f"open_{unique_key}"):
+                st.session_state['selected_claim_for_attestation'] = {
+                    'claim_data': row,
+                    'unique_key': unique_key
+                }
+                st.rerun()
+        elif row['attestation_status'] == 'Signed':
+            if st.button(f"✅ Verify", key=f"verify_{unique_key}"):
+                db.set_attestation_status(row['claim_id'], 'Verified')
+                _invalidate_claims_cache()
+                st.success(f"Claim {row['claim_id']} verified!")
+                st.rerun()
+
+
+@st.fragment
 def show_attestation_modal(claim_row, unique_key) -> None:
-    """Show attestation modal for signature capture."""
+    """Show attestation modal for signature capture.
+
+    Runs as a fragment so typing the signature name or toggling the attest
+    checkbox reruns only the modal, not the surrounding dashboard."""
     # Convert dict back to Series if needed
     if isinstance(claim_row, dict):
         import pandas as pd
@@ -405,7 +613,11 @@ def show_attestation_modal(claim_row, unique_key) -> None:
         
         # Issues
         st.write("**Compliance Issues Identified:**")
-        issues_list = claim_row['issues'].split('; ') if claim_row['issues'] else []
+        raw_issues = claim_row['issues']
+        if isinstance(raw_issues, list):
+            issues_list = raw_issues
+        else:
+            issues_list = raw_issues.split('; ') if raw_issues else []
         for issue in issues_list:
             st.write(f"• {issue}")
         
@@ -432,7 +644,8 @@ def show_attestation_modal(claim_row, unique_key) -> None:
                 if attest_checkbox and signed_name:
                     # Update database
                     db.set_attestation_status(claim_row['claim_id'], 'Signed', signed_name)
-                    
+                    _invalidate_claims_cache()
+
                     # Create signature record
                     from datetime import datetime
                     signature_record = f"Electronically signed by {signed_name} on {datetime.utcnow().isoformat()}"
@@ -458,45 +671,47 @@ def remind_pending_attestations(claims_df) -> None:
     from datetime import datetime, timedelta
     
     cutoff_time = datetime.utcnow() - timedelta(hours=48)
-    reminded_count = 0
-    
-    for idx, row in claims_df.iterrows():
-        if row['attestation_status'] == 'Pending':
-            # Check if reminder needed
-            needs_reminder = False
-            
-            if pd.isna(row['last_reminder_at']):
-                # Never reminded
-                needs_reminder = True
-            else:
-                # Check if last reminder was > 48h ago
-                try:
-                    last_reminder = pd.to_datetime(row['last_reminder_at'])
-                    if last_reminder < cutoff_time:
-                        needs_reminder = True
-                except:
-                    needs_reminder = True
-            
-            if needs_reminder:
-                # Mock send reminder (console log)
-                print(f"📧 REMINDER SENT: Provider {row['provider']} for Claim {row['claim_id']}")
-                
-                # Update last_reminder_at
-                db.mark_reminded(row['claim_id'])
-                reminded_count += 1
-    
+
+    # Vectorized filter: pending claims never reminded, reminded > 48h ago,
+    # or with unparseable reminder timestamps (errors='coerce' -> NaT).
+    # One column-level to_datetime pass and one mask index, no subset copies.
+    last_reminder = pd.to_datetime(claims_df['last_reminder_at'], errors='coerce')
+    pending_mask = claims_df['attestation_status'].eq('Pending').to_numpy()
+    stale_mask = (last_reminder.isna() | (last_reminder < cutoff_time)).to_numpy()
+    to_remind = claims_df.loc[pending_mask & stale_mask]
+
+    # Mock send reminders (console log)
+    for claim_id, provider in zip(to_remind['claim_id'], to_remind['provider']):
+        print(f"📧 REMINDER SENT: Provider {provider} for Claim {claim_id}")
+
+    # One batched UPDATE instead of one commit per claim
+    db.mark_reminded_bulk(to_remind['claim_id'].tolist())
+    reminded_count = len(to_remind)
+
+
     if reminded_count > 0:
+        _invalidate_claims_cache()
         st.success(f"🔔 Sent {reminded_count} reminder(s)")
         st.toast(f"Sent {reminded_count} reminder(s) for pending attestations")
     else:
         st.info("ℹ️ No reminders needed - all pending attestations are within 48 hours")
 
 
-def display_compliance_results(df_with_issues: pd.DataFrame) -> None:
+def flagged_claims_mask(df_with_issues: pd.DataFrame) -> pd.Series:
+    """Return the boolean mask of flagged claims, reusing the cached column when present."""
+    if '_HasIssue' in df_with_issues.columns:
+        return df_with_issues['_HasIssue']
+    # Empty issue lists are falsy, so map(bool) is one C-level pass
+    return df_with_issues['Issues'].map(bool)
+
+
+def display_compliance_results(df_with_issues: pd.DataFrame, has_issue: pd.Series = None) -> None:
     """Display compliance check results."""
-    
+
+    if has_issue is None:
+        has_issue = flagged_claims_mask(df_with_issues)
     total_claims = len(df_with_issues)
-    claims_with_issues = len(df_with_issues[df_with_issues['Issues'].apply(lambda x: len(x) > 0)])
+    claims_with_issues = int(has_issue.sum())
     clean_claims = total_claims - claims_with_issues
     
     col1, col2, col3 = st.columns(3)
@@ -510,19 +725,28 @@ def display_compliance_results(df_with_issues: pd.DataFrame) -> None:
     st.subheader("📊 Claims with Issues")
     
     if claims_with_issues > 0:
-        display_df = df_with_issues.copy()
-        display_df['Issues_Formatted'] = display_df['Issues'].apply(
-            lambda issues: '; '.join(issues) if issues else 'No issues'
-        )
-        
-        display_columns = ['ClaimID', 'Provider', 'PatientID', 'ICD10', 'ProcCode', 'DocStatus', 'ServiceDate', 'Issues_Formatted']
-        available_columns = [col for col in display_columns if col in display_df.columns]
-        
-        claims_with_issues_df = display_df[display_df['Issues'].apply(lambda x: len(x) > 0)]
-        
+        # Format only the flagged rows, without copying the whole DataFrame.
+        # Decoding the packed bitmask is a small-table lookup per row.
+        flagged_df = df_with_issues.loc[has_issue]
+        if 'Issues_Str' in flagged_df.columns:
+            # Serialized once at ingest; nothing to recompute here
+            formatted = flagged_df['Issues_Str']
+        elif 'IssuesBits' in flagged_df.columns:
+            from scrub import format_issue_bits
+            formatted = format_issue_bits(flagged_df['IssuesBits'].to_numpy())
+        else:
+            # Flagged rows always have issues, so a plain map-join suffices
+            formatted = flagged_df['Issues'].map('; '.join)
+        issues_fmt = pd.Series(formatted, index=flagged_df.index, name='Issues_Formatted')
+
+        display_columns = ['ClaimID', 'Provider', 'PatientID', 'ICD10', 'ProcCode', 'DocStatus', 'ServiceDate']
+        available_columns = [col for col in display_columns if col in flagged_df.columns]
+
+        claims_with_issues_df = flagged_df[available_columns].assign(Issues_Formatted=issues_fmt)
+
         if not claims_with_issues_df.empty:
             st.dataframe(
-                claims_with_issues_df[available_columns], 
+                claims_with_issues_df,
                 use_container_width=True,
                 column_config={
                     "Issues_Formatted": st.column_config.TextColumn(
@@ -543,18 +767,25 @@ def display_compliance_results(df_with_issues: pd.DataFrame) -> None:
         st.dataframe(df_with_issues[available_columns], use_container_width=True)
 
 
-def generate_download_buttons(df_with_issues: pd.DataFrame) -> None:
+def generate_download_buttons(df_with_issues: pd.DataFrame, has_issue: pd.Series = None) -> None:
     """Generate download buttons for CSV and ZIP files."""
     st.subheader("📥 Downloads")
-    
-    claims_with_issues = len(df_with_issues[df_with_issues['Issues'].apply(lambda x: len(x) > 0)])
-    
+
+    if has_issue is None:
+        has_issue = flagged_claims_mask(df_with_issues)
+    claims_with_issues = int(has_issue.sum())
+    uploaded_csv = st.session_state.get('uploaded_csv_bytes')
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.write("**📄 CSV Export**")
         try:
-            csv_bytes = cleaned_csv_bytes(df_with_issues)
+            if uploaded_csv is not None:
+                csv_bytes = flagged_csv_payload(uploaded_csv)
+            else:
+                from scrub import cleaned_csv_bytes
+                csv_bytes = cleaned_csv_bytes(df_with_issues)
             st.download_button(
                 label="📄 Download Claims with Issues (CSV)",
                 data=csv_bytes,
@@ -568,17 +799,29 @@ def generate_download_buttons(df_with_issues: pd.DataFrame) -> None:
     with col2:
         st.write("**📦 Provider Attestations**")
         if claims_with_issues > 0:
-            try:
-                zip_bytes = zip_attestations(df_with_issues)
+            # Defer the expensive PDF/ZIP build until explicitly requested so
+            # rendering the results never blocks on PDF generation
+            zip_key = hash(uploaded_csv) if uploaded_csv is not None else None
+            if st.button("📦 Prepare Attestation PDFs (ZIP)", use_container_width=True):
+                try:
+                    with st.spinner("Generating attestation PDFs..."):
+                        if uploaded_csv is not None:
+                            zip_bytes = attestation_zip_payload(uploaded_csv)
+                        else:
+                            from pdfs import zip_attestations
+                            zip_bytes = zip_attestations(df_with_issues)
+                    st.session_state['zip_bytes'] = zip_bytes
+                    st.session_state['zip_bytes_key'] = zip_key
+                except Exception as e:
+                    st.error(f"❌ Error generating ZIP: {str(e)}")
+            if 'zip_bytes' in st.session_state and st.session_state.get('zip_bytes_key') == zip_key:
                 st.download_button(
                     label="📦 Download Provider Attestation PDFs (ZIP)",
-                    data=zip_bytes,
+                    data=st.session_state['zip_bytes'],
                     file_name="provider_attestations.zip",
                     mime="application/zip",
                     use_container_width=True
                 )
-            except Exception as e:
-                st.error(f"❌ Error generating ZIP: {str(e)}")
         else:
             st.info("ℹ️ No attestation PDFs needed - all claims are clean!")
     
@@ -589,38 +832,39 @@ def generate_download_buttons(df_with_issues: pd.DataFrame) -> None:
         st.success("✅ **All claims are compliant!** No provider attestations needed.")
 
 
-def create_sample_data() -> pd.DataFrame:
+def create_sample_data(num_rows: int = 20) -> pd.DataFrame:
     """Create sample claims data for testing."""
-    import random
-    
+    import numpy as np
+
     providers = [
         "Dr. Sarah Johnson - Cardiology",
-        "Dr. Michael Chen - Orthopedics", 
+        "Dr. Michael Chen - Orthopedics",
         "Dr. Emily Rodriguez - Internal Medicine",
         "Dr. James Wilson - Dermatology",
         "Dr. Lisa Thompson - Pediatrics"
     ]
-    
+
     procedures = ["99213", "99214", "99215", "99202", "J9355", "J1940"]
     diagnoses = ["Z51.11", "E11.9", "M25.561", "L70.9", "I50.9", "C50.911"]
     doc_statuses = ["Complete", "Attached", "Pending", ""]
-    
-    data = []
-    for i in range(20):
-        diagnosis = random.choice(diagnoses)
-        procedure = random.choice(procedures)
-        doc_status = random.choice(doc_statuses)
-        data.append({
-            "ClaimID": f"CLM{i+1:04d}",
-            "Provider": random.choice(providers),
-            "PatientID": f"PAT{i+1:04d}",
-            "ICD10": diagnosis,
-            "ProcCode": procedure,
-            "DocStatus": doc_status,
-            "ServiceDate": f"2024-{random.randint(1,12):02d}-{random.randint(1,28):02d}"
-        })
-    
-    return pd.DataFrame(data)
+
+    # Bulk-sample every column at once instead of per-row random.choice calls
+    rng = np.random.default_rng()
+    n = num_rows
+    service_dates = (
+        pd.to_datetime('2024-01-01')
+        + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    ).strftime('%Y-%m-%d')
+
+    return pd.DataFrame({
+        "ClaimID": [f"CLM{i:04d}" for i in range(1, n + 1)],
+        "Provider": rng.choice(providers, n),
+        "PatientID": [f"PAT{i:04d}" for i in range(1, n + 1)],
+        "ICD10": rng.choice(diagnoses, n),
+        "ProcCode": rng.choice(procedures, n),
+        "DocStatus": rng.choice(doc_statuses, n),
+        "ServiceDate": service_dates
+    })
 
 
 if __name__ == "__main__":
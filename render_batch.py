@@ -0,0 +1,86 @@
+"""
+Payer Compliance Scrub - Batch Attestation Renderer
+CLI entrypoint for rendering attestation PDFs from a claims CSV.
+
+Uses only the stdlib csv/zipfile modules plus fpdf2, so it runs unchanged
+under pypy3, where the JIT speeds up fpdf's pure-Python rendering loop
+considerably on large batches:
+
+    pypy3 -m pip install fpdf2
+    pypy3 render_batch.py flagged_claims.csv attestations.zip
+
+The Streamlit UI keeps its CPython zip_attestations path; this script is
+for offline batch jobs only.
+"""
+
+import argparse
+import csv
+import sys
+import zipfile
+
+from pdfs import _normalize_issues, _sanitize_provider, make_attestation_pdf
+
+
+def render_batch(csv_path: str, zip_path: str, signature_name: str = None, signed_ts: str = None) -> int:
+    """
+    Render an attestation PDF per flagged CSV row into a ZIP archive.
+
+    Args:
+        csv_path: Input CSV with ClaimID, Provider, PatientID, ICD10,
+            ProcCode, ServiceDate and a semicolon-separated Issues column
+        zip_path: Output ZIP file path
+        signature_name: Optional signer name applied to every attestation
+        signed_ts: Optional ISO timestamp applied to every attestation
+
+    Returns:
+        Number of PDFs written
+    """
+    pdf_count = 0
+    audit_rows = []
+
+    with open(csv_path, newline='') as csv_file, \
+            zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zip_file:
+        for row in csv.DictReader(csv_file):
+            issues = _normalize_issues(row.get('Issues', ''))
+            if not issues:
+                continue
+
+            row['Issues'] = issues
+            pdf_bytes = make_attestation_pdf(row, signature_name, signed_ts)
+
+            claim_id = str(row.get('ClaimID', ''))
+            provider_name = str(row.get('Provider', ''))
+            safe_provider = _sanitize_provider(provider_name)
+
+            zip_file.writestr(f"Claim_{claim_id}_{safe_provider}.pdf", pdf_bytes)
+            pdf_count += 1
+            audit_rows.append([claim_id, provider_name, '; '.join(issues)])
+
+        if audit_rows:
+            lines = ["ClaimID,Provider,Issues"]
+            for audit_row in audit_rows:
+                lines.append(",".join('"{}"'.format(field.replace('"', '""')) for field in audit_row))
+            zip_file.writestr(
+                "audit_summary.csv", "\n".join(lines) + "\n",
+                compress_type=zipfile.ZIP_DEFLATED, compresslevel=1
+            )
+
+    return pdf_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render attestation PDFs from a claims CSV into a ZIP")
+    parser.add_argument("csv_path", help="Input claims CSV with an Issues column")
+    parser.add_argument("zip_path", help="Output ZIP path")
+    parser.add_argument("--signature", help="Signer name applied to every attestation")
+    parser.add_argument("--signed-at", help="ISO timestamp applied to every attestation")
+    args = parser.parse_args()
+
+    count = render_batch(args.csv_path, args.zip_path, args.signature, args.signed_at)
+    print(f"Wrote {count} attestation PDFs to {args.zip_path}")
+    if count == 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
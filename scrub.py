@@ -3,40 +3,194 @@ Payer Compliance Scrub - Core compliance checking logic
 Contains rules and processing functions for claims compliance validation.
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 import io
 
+# Optional: PyArrow's C++ CSV writer for large exports; minimal installs
+# fall back to pandas' writer
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
 
-@dataclass
+# Row count from which the cleaned-CSV export pays for the Arrow conversion
+PYARROW_CSV_MIN_ROWS = 10_000
+
+
+# Validation patterns and code sets used by the per-row check_* helpers,
+# compiled/frozen once at import so the hot loop skips the re-cache lookup
+# and list membership scan on every claim
+_CPT_RE = re.compile(r'^\d{5}$')
+_ICD10_RE = re.compile(r'^[A-Z]\d{2}(\.\d{1,4})?$')
+_NPI_RE = re.compile(r'^\d{10}$')
+_INVALID_PROC_CODES = frozenset({"00000", "99999", "11111"})
+_PLACEHOLDER_ICD_CODES = frozenset({"Z00.0", "Z99.9", "A00.0"})
+
+_REQUIRED_FIELDS = (
+    "claim_id", "provider_name", "patient_id",
+    "procedure_code", "billed_amount", "date_of_service"
+)
+
+# Issue messages whose parameters come from closed sets, formatted once at
+# import instead of re-allocating the same string per flagged row
+_MISSING_MSGS = {
+    field: f"CRITICAL: Missing required field '{field}'"
+    for field in _REQUIRED_FIELDS
+}
+_INVALID_PROC_MSGS = {
+    code: f"CRITICAL: Invalid procedure code '{code}'"
+    for code in _INVALID_PROC_CODES
+}
+
+
+@dataclass(slots=True)
 class ComplianceResult:
     """Result of compliance check for a single claim."""
     claim_id: str
     provider_name: str
     issues: List[str]
     severity: str  # "low", "medium", "high"
-    original_data: Dict[str, Any]
+    # Only the NPI is carried over from the claim row (it is all the PDF
+    # renderer reads); stashing the whole row here kept the entire dataset
+    # alive twice on large batches
+    rendering_npi: Optional[str] = None
 
 
 def process_claims(df: pd.DataFrame) -> List[ComplianceResult]:
     """
     Process a dataframe of claims and return compliance results.
-    
+
+    The field validations run as column-wise passes (regex matches via
+    .str.match, numeric coercion via pd.to_numeric, one vectorized
+    pd.to_datetime call) instead of invoking the per-row check_* helpers,
+    so regex/float/date parsing happens in C once per column rather than
+    once per row. Missing cells (NaN) are skipped by the format checks
+    rather than stringified to 'nan' and reported as malformed. The
+    per-claim helpers remain the reference implementation for
+    single-claim checks.
+
     Args:
         df: DataFrame containing claims data
-        
+
     Returns:
         List of ComplianceResult objects
     """
+    if df.empty:
+        return []
+
+    # A field is missing when its value is falsy (None, '', 0) or blank
+    # after stripping, mirroring check_required_fields
+    missing = {}
+    for field in _REQUIRED_FIELDS:
+        if field in df.columns:
+            raw = df[field]
+            missing[field] = (
+                ~raw.astype(bool) | raw.astype(str).str.strip().eq("")
+            ).to_numpy()
+        else:
+            missing[field] = np.ones(len(df), dtype=bool)
+
+    # Code format checks: one compiled-regex pass per column
+    proc = _str_column(df, "procedure_code")
+    has_proc = proc.ne("").to_numpy()
+    bad_proc = has_proc & ~proc.str.match(_CPT_RE).to_numpy()
+    invalid_proc = has_proc & proc.isin(_INVALID_PROC_CODES).to_numpy()
+
+    diag = _str_column(df, "diagnosis_code")
+    has_diag = diag.ne("").to_numpy()
+    bad_diag = has_diag & ~diag.str.match(_ICD10_RE).to_numpy()
+    placeholder_diag = has_diag & diag.isin(_PLACEHOLDER_ICD_CODES).to_numpy()
+
+    npi = _str_column(df, "rendering_npi")
+    has_npi = npi.ne("").to_numpy()
+    bad_npi = has_npi & ~npi.str.match(_NPI_RE).to_numpy()
+    placeholder_npi = has_npi & (
+        npi.str.startswith("000000000") | npi.eq("1234567890")
+    ).to_numpy()
+
+    # Billing amounts: a single C-level coercion replaces try/except float()
+    if "billed_amount" in df.columns:
+        raw_amount = df["billed_amount"]
+    else:
+        raw_amount = pd.Series(None, index=df.index, dtype=object)
+    amounts = pd.to_numeric(raw_amount, errors="coerce")
+    bad_amount = (raw_amount.notna() & amounts.isna()).to_numpy()
+    negative = (amounts < 0).to_numpy()
+    high = (amounts > 10000).to_numpy()
+    zero = (amounts == 0).to_numpy()
+    amount_values = amounts.to_numpy()
+
+    # Dates: one vectorized parse instead of N strptime calls
+    date_str = _str_column(df, "date_of_service")
+    has_date = date_str.ne("").to_numpy()
+    dates = pd.to_datetime(date_str, format="%Y-%m-%d", errors="coerce")
+    bad_date = has_date & dates.isna().to_numpy()
+    now = pd.Timestamp.now()
+    future = (dates > now).to_numpy()
+    too_old = (dates < now - pd.Timedelta(days=730)).to_numpy()
+
+    proc_values = proc.to_numpy()
+    diag_values = diag.to_numpy()
+    npi_values = npi.to_numpy()
+    date_values = date_str.to_numpy()
+    claim_ids = _str_column(df, "claim_id").to_numpy()
+    providers = _str_column(df, "provider_name").to_numpy()
+    raw_amount_values = raw_amount.to_numpy()
+
     results = []
-    
-    for _, row in df.iterrows():
-        result = check_claim_compliance(row.to_dict())
-        results.append(result)
-    
+    for i in range(len(df)):
+        issues = []
+        for field in _REQUIRED_FIELDS:
+            if missing[field][i]:
+                issues.append(_MISSING_MSGS[field])
+        if bad_proc[i]:
+            issues.append(f"WARNING: Invalid procedure code format '{proc_values[i]}' - should be 5 digits")
+        if invalid_proc[i]:
+            issues.append(_INVALID_PROC_MSGS[proc_values[i]])
+        if bad_diag[i]:
+            issues.append(f"WARNING: Invalid diagnosis code format '{diag_values[i]}' - should be ICD-10 format")
+        if placeholder_diag[i]:
+            issues.append(f"WARNING: Placeholder diagnosis code '{diag_values[i]}' may need review")
+        if negative[i]:
+            issues.append(f"CRITICAL: Negative billing amount ${amount_values[i]}")
+        if high[i]:
+            issues.append(f"WARNING: Unusually high billing amount ${amount_values[i]} - may need review")
+        if zero[i]:
+            issues.append("WARNING: Zero billing amount - may indicate missing data")
+        if bad_amount[i]:
+            issues.append(f"CRITICAL: Invalid billing amount format '{raw_amount_values[i]}'")
+        if bad_npi[i]:
+            issues.append(f"WARNING: Invalid NPI format '{npi_values[i]}' - should be 10 digits")
+        if placeholder_npi[i]:
+            issues.append(f"WARNING: Placeholder NPI '{npi_values[i]}' may need verification")
+        if future[i]:
+            issues.append(f"WARNING: Future date of service '{date_values[i]}'")
+        if too_old[i]:
+            issues.append(f"WARNING: Very old date of service '{date_values[i]}' - may be outside filing window")
+        if bad_date[i]:
+            issues.append(f"CRITICAL: Invalid date format '{date_values[i]}' - should be YYYY-MM-DD")
+
+        severity = "low"
+        if any("CRITICAL" in issue for issue in issues):
+            severity = "high"
+        elif any("WARNING" in issue for issue in issues):
+            severity = "medium"
+
+        results.append(ComplianceResult(
+            claim_id=claim_ids[i],
+            provider_name=providers[i],
+            issues=issues,
+            severity=severity,
+            rendering_npi=npi_values[i] or None
+        ))
+
     return results
 
 
@@ -63,7 +217,9 @@ def check_claim_compliance(claim_data: Dict[str, Any]) -> ComplianceResult:
     issues.extend(check_diagnosis_codes(claim_data))
     issues.extend(check_billing_amounts(claim_data))
     issues.extend(check_npi_format(claim_data))
-    issues.extend(check_date_format(claim_data))
+    # One clock read for both date checks
+    now = datetime.now()
+    issues.extend(check_date_format(claim_data, now, now - timedelta(days=730)))
     
     # Determine severity
     if any("CRITICAL" in issue for issue in issues):
@@ -71,27 +227,24 @@ def check_claim_compliance(claim_data: Dict[str, Any]) -> ComplianceResult:
     elif any("WARNING" in issue for issue in issues):
         severity = "medium"
     
+    npi = claim_data.get("rendering_npi")
     return ComplianceResult(
         claim_id=claim_id,
         provider_name=provider_name,
         issues=issues,
         severity=severity,
-        original_data=claim_data
+        rendering_npi=str(npi) if npi is not None else None
     )
 
 
 def check_required_fields(claim_data: Dict[str, Any]) -> List[str]:
     """Check for missing required fields."""
     issues = []
-    required_fields = [
-        "claim_id", "provider_name", "patient_id", 
-        "procedure_code", "billed_amount", "date_of_service"
-    ]
-    
-    for field in required_fields:
+
+    for field in _REQUIRED_FIELDS:
         if not claim_data.get(field) or str(claim_data.get(field)).strip() == "":
-            issues.append(f"CRITICAL: Missing required field '{field}'")
-    
+            issues.append(_MISSING_MSGS[field])
+
     return issues
 
 
@@ -104,13 +257,12 @@ def check_procedure_codes(claim_data: Dict[str, Any]) -> List[str]:
         return issues
     
     # Check for valid CPT format (5 digits)
-    if not re.match(r'^\d{5}$', procedure_code):
+    if not _CPT_RE.match(procedure_code):
         issues.append(f"WARNING: Invalid procedure code format '{procedure_code}' - should be 5 digits")
-    
+
     # Check for common invalid codes
-    invalid_codes = ["00000", "99999", "11111"]
-    if procedure_code in invalid_codes:
-        issues.append(f"CRITICAL: Invalid procedure code '{procedure_code}'")
+    if procedure_code in _INVALID_PROC_CODES:
+        issues.append(_INVALID_PROC_MSGS[procedure_code])
     
     return issues
 
@@ -124,12 +276,11 @@ def check_diagnosis_codes(claim_data: Dict[str, Any]) -> List[str]:
         return issues
     
     # Basic ICD-10 format check (letter followed by digits and optional decimal)
-    if not re.match(r'^[A-Z]\d{2}(\.\d{1,4})?$', diagnosis_code):
+    if not _ICD10_RE.match(diagnosis_code):
         issues.append(f"WARNING: Invalid diagnosis code format '{diagnosis_code}' - should be ICD-10 format")
-    
+
     # Check for placeholder codes
-    placeholder_codes = ["Z00.0", "Z99.9", "A00.0"]
-    if diagnosis_code in placeholder_codes:
+    if diagnosis_code in _PLACEHOLDER_ICD_CODES:
         issues.append(f"WARNING: Placeholder diagnosis code '{diagnosis_code}' may need review")
     
     return issues
@@ -156,7 +307,7 @@ def check_billing_amounts(claim_data: Dict[str, Any]) -> List[str]:
         
         # Check for zero amounts
         if amount == 0:
-            issues.append(f"WARNING: Zero billing amount - may indicate missing data")
+            issues.append("WARNING: Zero billing amount - may indicate missing data")
             
     except (ValueError, TypeError):
         issues.append(f"CRITICAL: Invalid billing amount format '{billed_amount}'")
@@ -173,7 +324,7 @@ def check_npi_format(claim_data: Dict[str, Any]) -> List[str]:
         return issues
     
     # NPI should be 10 digits
-    if not re.match(r'^\d{10}$', npi):
+    if not _NPI_RE.match(npi):
         issues.append(f"WARNING: Invalid NPI format '{npi}' - should be 10 digits")
     
     # Check for placeholder NPIs
@@ -183,33 +334,65 @@ def check_npi_format(claim_data: Dict[str, Any]) -> List[str]:
     return issues
 
 
-def check_date_format(claim_data: Dict[str, Any]) -> List[str]:
-    """Validate date formats and reasonableness."""
+def check_date_format(claim_data: Dict[str, Any], now: datetime = None,
+                      two_years_ago: datetime = None) -> List[str]:
+    """
+    Validate date formats and reasonableness.
+
+    Batch callers pass now/two_years_ago so the clock is read once per
+    batch instead of twice per claim; called standalone, both default to
+    the current time.
+    """
     issues = []
     date_str = str(claim_data.get("date_of_service", ""))
-    
+
     if not date_str:
         return issues
-    
+
+    if now is None:
+        now = datetime.now()
+    if two_years_ago is None:
+        two_years_ago = now - timedelta(days=730)
+
     try:
         # Try to parse the date
         date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        
+
         # Check if date is in the future
-        if date_obj > datetime.now():
+        if date_obj > now:
             issues.append(f"WARNING: Future date of service '{date_str}'")
-        
+
         # Check if date is too far in the past (more than 2 years)
-        from datetime import timedelta
-        if date_obj < datetime.now() - timedelta(days=730):
+        if date_obj < two_years_ago:
             issues.append(f"WARNING: Very old date of service '{date_str}' - may be outside filing window")
-            
+
     except ValueError:
         issues.append(f"CRITICAL: Invalid date format '{date_str}' - should be YYYY-MM-DD")
-    
+
     return issues
 
 
+# Code sets shared by the row-wise and vectorized rule engines
+# (frozenset membership is an O(1) hash lookup in the per-row path)
+HIGH_COST_PROC_CODES = frozenset({"J9355", "J1940"})
+NCCI_DEMO_CODES = frozenset({"11055", "99213"})  # DEMO ONLY - minimal hardcoded set
+TELEHEALTH_CPTS = frozenset({"99212", "99213", "99214", "99215"})
+TELEHEALTH_POS_CODES = frozenset({"02", "10"})
+HIGH_AUDIT_RISK_ICD10_PREFIXES = ("I50", "C50")
+
+# Compiled prefix alternation - one DFA pass per code regardless of how many
+# prefixes the ruleset grows to, instead of a startswith call per prefix
+HIGH_RISK_ICD10_RE = re.compile(
+    r'^(?:' + '|'.join(map(re.escape, HIGH_AUDIT_RISK_ICD10_PREFIXES)) + r')'
+)
+
+# The same prefixes as fixed-width bytes, for the packed |S3 comparison used
+# in the vectorized path (NumPy compares |S3 items with memcmp)
+HIGH_RISK_ICD10_PREFIX_BYTES = np.array(
+    [p.encode('ascii') for p in HIGH_AUDIT_RISK_ICD10_PREFIXES], dtype='S3'
+)
+
+
 # Centralized issue label mapping for consistent terminology
 ISSUE_LABEL_MAPPING = {
     "Missing documentation": "Medical record not available for date of service",
@@ -250,18 +433,18 @@ def check_claim(row: Dict[str, Any]) -> List[str]:
     # Rule 2: Mismatched documentation
     # High-cost procedures (J9355, J1940) require "Attached" documentation status
     # If they have "Complete" status instead, it's a mismatch
-    if row.get("DocStatus") == "Complete" and row.get("ProcCode") in ["J9355", "J1940"]:
+    if row.get("DocStatus") == "Complete" and row.get("ProcCode") in HIGH_COST_PROC_CODES:
         issues.append("Mismatched documentation")
     
     # Rule 3: High-audit-risk diagnosis codes
     icd10 = str(row.get("ICD10", ""))
-    if icd10.startswith("I50") or icd10.startswith("C50"):
+    if HIGH_RISK_ICD10_RE.match(icd10):
         issues.append("High-audit-risk diagnosis")
     
     # Rule 4: High-cost procedure requires attached documentation
     proc_code = str(row.get("ProcCode", ""))
     doc_status = str(row.get("DocStatus", ""))
-    if proc_code in ["J9355", "J1940"] and doc_status != "Attached":
+    if proc_code in HIGH_COST_PROC_CODES and doc_status != "Attached":
         issues.append("High-cost procedure requires attached documentation")
     
     # Rule 5: NCCI pair check (DEMO ONLY - hardcoded pairs)
@@ -269,7 +452,7 @@ def check_claim(row: Dict[str, Any]) -> List[str]:
     # In production, this would use a comprehensive NCCI database
     ncci_pairs = {("11055", "99213")}  # DEMO ONLY - minimal hardcoded set
     proc_code = str(row.get("ProcCode", ""))
-    if proc_code in ["11055", "99213"]:  # Check if either code is in our demo pairs
+    if proc_code in NCCI_DEMO_CODES:  # Check if either code is in our demo pairs
         for pair in ncci_pairs:
             if proc_code in pair:
                 # Simple check - in real implementation would check for both codes on same claim
@@ -279,11 +462,10 @@ def check_claim(row: Dict[str, Any]) -> List[str]:
     # Rule 6: Telehealth modifier check (DEMO ONLY - hardcoded rules)
     # NOTE: This is a demonstration stub with simplified logic
     # In production, this would use comprehensive telehealth billing rules
-    telehealth_cpts = {"99212", "99213", "99214", "99215"}
     pos = str(row.get("POS", ""))
     modifiers = str(row.get("Modifiers", ""))
-    
-    if proc_code in telehealth_cpts and pos in ["02", "10"]:
+
+    if proc_code in TELEHEALTH_CPTS and pos in TELEHEALTH_POS_CODES:
         if "95" not in modifiers:
             issues.append("Missing telehealth modifier")
     
@@ -321,40 +503,250 @@ def get_compliance_summary(results: List[ComplianceResult]) -> Dict[str, Any]:
     }
 
 
+# Issue labels in rule order, pre-mapped to standardized terminology so the
+# vectorized engine produces the same strings as check_claim
+RULE_LABELS = np.array(map_issue_labels([
+    "Missing documentation",
+    "Mismatched documentation",
+    "High-audit-risk diagnosis",
+    "High-cost procedure requires attached documentation",
+    "Potential non-covered pair",
+    "Missing telehealth modifier",
+]), dtype=object)
+
+
+# Row count above which rule masks are computed on the GPU when cuDF is available
+CUDF_MIN_ROWS = 100_000
+
+# Row count above which the fused numba kernel is preferred when available
+NUMBA_MIN_ROWS = 10_000
+
+# Compiled numba kernel, created lazily on first large-batch call
+_numba_kernel = None
+
+
+def _str_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Return a column coerced to strings, or an empty-string column if absent."""
+    if name in df.columns:
+        return df[name].fillna('').astype(str)
+    return pd.Series('', index=df.index)
+
+
+def _rule_masks(df: pd.DataFrame) -> np.ndarray:
+    """Evaluate the six compliance rules as an (n_rows, n_rules) boolean matrix."""
+    # Normalize the columns the rules read (missing columns become empty strings)
+    doc_status = _str_column(df, 'DocStatus')
+    proc_code = _str_column(df, 'ProcCode')
+    icd10 = _str_column(df, 'ICD10')
+    pos = _str_column(df, 'POS')
+    modifiers = _str_column(df, 'Modifiers')
+
+    high_cost = proc_code.isin(HIGH_COST_PROC_CODES)
+
+    # Rule 3 compares the fixed-width 3-byte code prefix against the
+    # configured set - a contiguous memcmp pass with no per-row string
+    # objects. Non-ASCII codes (malformed input) fall back to the regex.
+    try:
+        prefix3 = icd10.str.slice(0, 3).to_numpy().astype('S3')
+        high_risk = np.isin(prefix3, HIGH_RISK_ICD10_PREFIX_BYTES)
+    except UnicodeEncodeError:
+        high_risk = icd10.str.match(HIGH_RISK_ICD10_RE).to_numpy()
+
+    # One boolean mask per rule, stacked into an (n_rows, n_rules) matrix
+    return np.column_stack([
+        doc_status.str.strip().eq('').to_numpy(),                               # Rule 1: Missing documentation
+        (doc_status.eq('Complete') & high_cost).to_numpy(),                     # Rule 2: Mismatched documentation
+        high_risk,                                                              # Rule 3: High-audit-risk diagnosis
+        (high_cost & doc_status.ne('Attached')).to_numpy(),                     # Rule 4: High-cost procedure needs attached docs
+        proc_code.isin(NCCI_DEMO_CODES).to_numpy(),                             # Rule 5: NCCI pair check (DEMO ONLY)
+        (proc_code.isin(TELEHEALTH_CPTS)
+         & pos.isin(TELEHEALTH_POS_CODES)
+         & ~modifiers.str.contains('95', regex=False)).to_numpy(),              # Rule 6: Telehealth modifier check (DEMO ONLY)
+    ])
+
+
+def _get_numba_kernel():
+    """Compile (once) the fused rule kernel over factorized integer codes."""
+    global _numba_kernel
+    if _numba_kernel is None:
+        from numba import njit, prange
+
+        @njit(parallel=True, cache=True)
+        def kernel(doc_codes, proc_codes, icd_codes, pos_codes, mod_codes,
+                   doc_empty, doc_complete, doc_attached,
+                   proc_high_cost, proc_ncci, proc_tele,
+                   icd_high_risk, pos_tele, mod_has95):
+            n = doc_codes.shape[0]
+            out = np.zeros((n, 6), dtype=np.bool_)
+            for i in prange(n):
+                d = doc_codes[i]
+                p = proc_codes[i]
+                high_cost = proc_high_cost[p]
+                out[i, 0] = doc_empty[d]
+                out[i, 1] = doc_complete[d] and high_cost
+                out[i, 2] = icd_high_risk[icd_codes[i]]
+                out[i, 3] = high_cost and not doc_attached[d]
+                out[i, 4] = proc_ncci[p]
+                out[i, 5] = proc_tele[p] and pos_tele[pos_codes[i]] and not mod_has95[mod_codes[i]]
+            return out
+
+        _numba_kernel = kernel
+    return _numba_kernel
+
+
+def _rule_masks_numba(df: pd.DataFrame) -> np.ndarray:
+    """
+    Fused single-pass variant of _rule_masks for large batches.
+
+    numba's nopython mode cannot traverse Python string arrays, so each
+    column is factorized first and the string predicates are evaluated once
+    per unique value; the JIT kernel then fuses all six rules into one
+    traversal over the integer code arrays.
+    """
+    kernel = _get_numba_kernel()
+
+    def codes_and_uniques(name):
+        codes, uniques = pd.factorize(_str_column(df, name))
+        return codes, pd.Index(uniques).astype(str)
+
+    doc_codes, doc_u = codes_and_uniques('DocStatus')
+    proc_codes, proc_u = codes_and_uniques('ProcCode')
+    icd_codes, icd_u = codes_and_uniques('ICD10')
+    pos_codes, pos_u = codes_and_uniques('POS')
+    mod_codes, mod_u = codes_and_uniques('Modifiers')
+
+    return kernel(
+        doc_codes, proc_codes, icd_codes, pos_codes, mod_codes,
+        doc_u.str.strip().to_numpy() == '',
+        doc_u.to_numpy() == 'Complete',
+        doc_u.to_numpy() == 'Attached',
+        np.asarray(proc_u.isin(HIGH_COST_PROC_CODES)),
+        np.asarray(proc_u.isin(NCCI_DEMO_CODES)),
+        np.asarray(proc_u.isin(TELEHEALTH_CPTS)),
+        np.asarray(icd_u.str.match(HIGH_RISK_ICD10_RE)),
+        np.asarray(pos_u.isin(TELEHEALTH_POS_CODES)),
+        np.asarray(mod_u.str.contains('95', regex=False)),
+    )
+
+
+def _rule_masks_cudf(df: pd.DataFrame) -> np.ndarray:
+    """GPU variant of _rule_masks for large batches; mirrors the pandas kernels."""
+    import cudf
+
+    gdf = cudf.from_pandas(df[[c for c in ('DocStatus', 'ProcCode', 'ICD10', 'POS', 'Modifiers')
+                               if c in df.columns]])
+
+    def col(name):
+        if name in gdf.columns:
+            return gdf[name].fillna('').astype(str)
+        return cudf.Series([''] * len(gdf))
+
+    doc_status = col('DocStatus')
+    proc_code = col('ProcCode')
+    icd10 = col('ICD10')
+    pos = col('POS')
+    modifiers = col('Modifiers')
+
+    high_cost = proc_code.isin(list(HIGH_COST_PROC_CODES))
+
+    masks = [
+        doc_status.str.strip() == '',
+        (doc_status == 'Complete') & high_cost,
+        icd10.str.startswith('I50') | icd10.str.startswith('C50'),
+        high_cost & (doc_status != 'Attached'),
+        proc_code.isin(list(NCCI_DEMO_CODES)),
+        (proc_code.isin(list(TELEHEALTH_CPTS))
+         & pos.isin(list(TELEHEALTH_POS_CODES))
+         & ~modifiers.str.contains('95', regex=False)),
+    ]
+    return np.column_stack([m.to_numpy() for m in masks])
+
+
 def apply_checks(df: pd.DataFrame) -> pd.DataFrame:
     """
     Apply compliance checks to a DataFrame and add an Issues column.
-    
-    This function processes each row in the DataFrame using the check_claim function
-    and adds a new 'Issues' column containing the list of compliance issues found.
-    
+
+    This function evaluates the compliance rules as vectorized boolean masks
+    over whole columns (instead of per-row Python calls) and adds a new
+    'Issues' column containing the list of compliance issues found, plus an
+    internal '_HasIssue' boolean column so downstream consumers can reuse the
+    flagged mask without re-scanning the Issues lists.
+
     Args:
         df: DataFrame containing claims data with columns matching the expected format
-        
+
     Returns:
-        DataFrame with an additional 'Issues' column containing compliance issues
-        
+        DataFrame with additional 'Issues' and '_HasIssue' columns
+
     Raises:
         ValueError: If the DataFrame is empty or missing required columns
     """
     if df.empty:
         raise ValueError("DataFrame cannot be empty")
-    
+
     # Create a copy to avoid modifying the original DataFrame
     result_df = df.copy()
-    
-    # Apply compliance checks to each row
-    issues_list = []
-    for _, row in df.iterrows():
-        issues = check_claim(row.to_dict())
-        issues_list.append(issues)
-    
-    # Add the Issues column
-    result_df['Issues'] = issues_list
-    
+
+    # Large batches take the GPU path when cuDF is installed; CPU-only
+    # deployments (and small frames) stay on the pandas kernels
+    masks = None
+    if len(df) >= CUDF_MIN_ROWS:
+        try:
+            masks = _rule_masks_cudf(df)
+        except ImportError:
+            masks = None
+    if masks is None and len(df) >= NUMBA_MIN_ROWS:
+        try:
+            masks = _rule_masks_numba(df)
+        except ImportError:
+            masks = None
+    if masks is None:
+        masks = _rule_masks(df)
+
+    has_issue = masks.any(axis=1)
+
+    # Gather issue labels only for flagged rows; clean rows get an empty list
+    result_df['Issues'] = [
+        RULE_LABELS[mask_row].tolist() if flagged else []
+        for mask_row, flagged in zip(masks, has_issue)
+    ]
+    # Pack the per-rule hits into one uint8 per row (bit i set <=> rule i
+    # fired) so large-batch consumers can decode labels lazily at render time
+    result_df['IssuesBits'] = (
+        masks.astype(np.uint8) << np.arange(masks.shape[1], dtype=np.uint8)
+    ).sum(axis=1).astype(np.uint8)
+    result_df['_HasIssue'] = has_issue
+    # Serialize the display/persistence string once at ingest so renders and
+    # DB writes don't re-join the token lists per row
+    result_df['Issues_Str'] = result_df['Issues'].map('; '.join)
+
     return result_df
 
 
+def format_issue_bits(bits) -> List[str]:
+    """
+    Decode packed rule bits into display strings.
+
+    Args:
+        bits: Iterable of uint8 bitmasks as produced by apply_checks
+
+    Returns:
+        List of '; '-joined issue labels ('No issues' for zero bits)
+    """
+    # Only 2**n_rules distinct values exist, so memoize the decoded strings
+    decoded: Dict[int, str] = {}
+    out = []
+    for b in bits:
+        b = int(b)
+        s = decoded.get(b)
+        if s is None:
+            labels = [label for i, label in enumerate(RULE_LABELS) if (b >> i) & 1]
+            s = '; '.join(labels) if labels else 'No issues'
+            decoded[b] = s
+        out.append(s)
+    return out
+
+
 def cleaned_csv_bytes(df: pd.DataFrame) -> bytes:
     """
     Export a DataFrame to CSV format as bytes, including only flagged claims.
@@ -376,31 +768,47 @@ def cleaned_csv_bytes(df: pd.DataFrame) -> bytes:
     
     if 'Issues' not in df.columns:
         raise ValueError("DataFrame must contain an 'Issues' column")
-    
-    # Filter to only include rows with issues
-    flagged_df = df[df['Issues'].apply(lambda x: len(x) > 0)].copy()
-    
+
+    # Filter to only include rows with issues (reuse the cached mask when
+    # present) and keep the internal helper columns out of the export
+    if '_HasIssue' in df.columns:
+        flagged_mask = df['_HasIssue']
+        df = df.drop(columns=[c for c in ('_HasIssue', 'IssuesBits') if c in df.columns])
+    else:
+        flagged_mask = df['Issues'].apply(lambda x: len(x) > 0)
+    flagged_df = df[flagged_mask].copy()
+
     if flagged_df.empty:
         # Return empty CSV with headers if no flagged claims
-        csv_buffer = io.StringIO()
-        df.head(0).to_csv(csv_buffer, index=False)
-        csv_string = csv_buffer.getvalue()
-        return csv_string.encode('utf-8')
-    
-    # Format Issues column as semicolon-joined string
+        csv_buffer = io.BytesIO()
+        headers_df = df.head(0)
+        if 'Issues_Str' in headers_df.columns:
+            headers_df = headers_df.drop(columns=['Issues_Str'])
+        headers_df.to_csv(csv_buffer, index=False, encoding='utf-8')
+        return csv_buffer.getvalue()
+    
+    # Format Issues column as semicolon-joined string, reusing the string
+    # serialized at ingest when it is available
     flagged_df = flagged_df.copy()
-    flagged_df['Issues'] = flagged_df['Issues'].apply(
-        lambda issues: '; '.join(issues) if issues else ''
-    )
-    
-    # Create a StringIO buffer to write CSV data
-    csv_buffer = io.StringIO()
-    
-    # Write DataFrame to CSV buffer
-    flagged_df.to_csv(csv_buffer, index=False)
-    
-    # Get the CSV string and convert to bytes
-    csv_string = csv_buffer.getvalue()
-    csv_bytes = csv_string.encode('utf-8')
-    
-    return csv_bytes
+    if 'Issues_Str' in flagged_df.columns:
+        flagged_df['Issues'] = flagged_df.pop('Issues_Str')
+    else:
+        flagged_df['Issues'] = flagged_df['Issues'].apply(
+            lambda issues: '; '.join(issues) if issues else ''
+        )
+    
+    # Large exports go through PyArrow's C++ CSV writer, typically 5-10x
+    # faster than pandas' writer; small frames stay on pandas since the
+    # Arrow table conversion has fixed overhead. Arrow quotes string cells
+    # more aggressively than pandas, but the parsed content is identical.
+    if pa is not None and len(flagged_df) >= PYARROW_CSV_MIN_ROWS:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(pa.Table.from_pandas(flagged_df, preserve_index=False), sink)
+        return sink.getvalue().to_pybytes()
+
+    # Encode straight into a binary buffer - writing text to StringIO and
+    # re-encoding afterwards holds the CSV in memory twice
+    csv_buffer = io.BytesIO()
+    flagged_df.to_csv(csv_buffer, index=False, encoding='utf-8')
+
+    return csv_buffer.getvalue()
@@ -9,7 +9,8 @@ import zipfile
 import io
 from datetime import datetime
 
-from pdfs import make_attestation_pdf, zip_attestations
+from pdfs import generate_batch_attestations, make_attestation_pdf, zip_attestations
+from scrub import ComplianceResult
 
 
 class TestMakeAttestationPdf:
@@ -504,5 +505,38 @@ class TestZipAttestations:
             assert len(pdf_files) >= 1  # At least one valid PDF should be generated
 
 
+class TestGenerateBatchAttestations:
+    """Test the generate_batch_attestations function."""
+
+    def test_generate_batch_attestations_flagged_claims(self):
+        """Test that a batch of flagged claims yields one valid PDF each."""
+        results = [
+            ComplianceResult(
+                f"CLM{i:03d}", f"Dr. Test {i}",
+                ["WARNING: Test issue"], "medium", "1234567891"
+            )
+            for i in range(6)
+        ]
+
+        attestations = generate_batch_attestations(results)
+
+        assert len(attestations) == len(results)
+        for pdf_bytes in attestations.values():
+            assert isinstance(pdf_bytes, bytes)
+            assert pdf_bytes.startswith(b'%PDF')
+
+    def test_generate_batch_attestations_skips_clean_claims(self):
+        """Test that clean claims produce no attestation."""
+        results = [
+            ComplianceResult("CLM001", "Dr. Clean", [], "low"),
+            ComplianceResult("CLM002", "Dr. Flagged", ["WARNING: Test issue"], "medium"),
+        ]
+
+        attestations = generate_batch_attestations(results)
+
+        assert list(attestations) == ["Dr._Flagged"]
+        assert attestations["Dr._Flagged"].startswith(b'%PDF')
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -244,10 +244,10 @@ class TestComplianceSummary:
     def test_summary_with_mixed_results(self):
         """Test summary generation with mixed compliance results."""
         results = [
-            ComplianceResult("CLM001", "Dr. Test", [], "low", {}),
-            ComplianceResult("CLM002", "Dr. Test", ["WARNING: Test issue"], "medium", {}),
-            ComplianceResult("CLM003", "Dr. Test", ["CRITICAL: Test issue"], "high", {}),
-            ComplianceResult("CLM004", "Dr. Test", [], "low", {})
+            ComplianceResult("CLM001", "Dr. Test", [], "low"),
+            ComplianceResult("CLM002", "Dr. Test", ["WARNING: Test issue"], "medium"),
+            ComplianceResult("CLM003", "Dr. Test", ["CRITICAL: Test issue"], "high"),
+            ComplianceResult("CLM004", "Dr. Test", [], "low")
         ]
         
         summary = get_compliance_summary(results)